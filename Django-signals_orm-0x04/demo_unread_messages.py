@@ -173,7 +173,7 @@ def demonstrate_unread_messages_manager(user1, user2, user3):
     
     # Verify that sent messages don't appear in unread messages
     print(f"\nVerifying that {user2.username}'s sent messages don't appear in their unread list...")
-    user2_sent_messages = Message.objects.filter(sender=user2, read=False)
+    user2_sent_messages = Message.objects.filter(sender=user2, is_read=False)
     print(f"User2 has {user2_sent_messages.count()} unread sent messages")
     
     unread_messages_user2_again = Message.unread.for_user(user2)
@@ -257,7 +257,7 @@ def demonstrate_query_optimization():
     print("The custom manager uses:")
     print("  - select_related('sender') for efficient user data retrieval")
     print("  - .only() to retrieve only necessary fields")
-    print("  - Database index on (receiver, read) for fast filtering")
+    print("  - Database index on (receiver, is_read) for fast filtering")
     
     # Show the fields that are retrieved
     if unread_messages.exists():
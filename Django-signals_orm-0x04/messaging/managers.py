@@ -1,6 +1,25 @@
+from django.core.cache import cache
 from django.db import models
 
 
+# Seconds a user's unread message count stays in the cache
+UNREAD_COUNT_CACHE_TIMEOUT = 60
+
+
+# Seconds a user's conversation list stays in the cache
+CONVERSATIONS_CACHE_TIMEOUT = 60
+
+
+def unread_count_cache_key(user_id):
+    """Cache key for the unread message count of the given user."""
+    return f'unread:{user_id}'
+
+
+def conversations_cache_key(user_id):
+    """Cache key for the conversation list of the given user."""
+    return f'conv:{user_id}'
+
+
 class UnreadMessagesManager(models.Manager):
     """
     Custom manager to filter unread messages for a specific user.
@@ -12,10 +31,10 @@ class UnreadMessagesManager(models.Manager):
         """
         return self.filter(
             receiver=user,
-            read=False
+            is_read=False
         ).select_related('sender').only(
             'id', 'sender__id', 'sender__username', 'content', 
-            'timestamp', 'read', 'parent_message'
+            'timestamp', 'is_read', 'parent_message', 'thread_root'
         ).order_by('-timestamp')
     
     def unread_for_user(self, user):
@@ -25,17 +44,36 @@ class UnreadMessagesManager(models.Manager):
         """
         return self.filter(
             receiver=user,
-            read=False
+            is_read=False
         ).select_related('sender').only(
             'id', 'sender__id', 'sender__username', 'content', 
-            'timestamp', 'read', 'parent_message'
+            'timestamp', 'is_read', 'parent_message', 'thread_root'
         ).order_by('-timestamp')
     
     def count_for_user(self, user):
         """
         Get the count of unread messages for a specific user.
+        The count is cached and dropped by the post_save and post_delete receivers;
+        bulk updates of is_read must call invalidate_read_state().
         """
-        return self.filter(
-            receiver=user,
-            read=False
-        ).count() 
\ No newline at end of file
+        return cache.get_or_set(
+            unread_count_cache_key(user.pk),
+            lambda: self.filter(receiver=user, is_read=False).count(),
+            UNREAD_COUNT_CACHE_TIMEOUT
+        )
+    
+    def invalidate_count(self, *user_ids):
+        """
+        Drop the cached unread counts of the given users.
+        """
+        cache.delete_many([unread_count_cache_key(user_id) for user_id in user_ids])
+    
+    def invalidate_read_state(self, *user_ids):
+        """
+        Drop the cached unread counts and conversation lists of the given users.
+        Call after bulk updates of is_read, which skip the post_save receivers.
+        """
+        cache.delete_many(
+            [unread_count_cache_key(user_id) for user_id in user_ids]
+            + [conversations_cache_key(user_id) for user_id in user_ids]
+        ) 
\ No newline at end of file
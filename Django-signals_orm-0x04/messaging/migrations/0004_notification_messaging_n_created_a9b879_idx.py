@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_alter_message_options_message_parent_message_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at'], name='messaging_n_created_a9b879_idx'),
+        ),
+    ]
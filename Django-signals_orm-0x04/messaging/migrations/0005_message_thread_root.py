@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_thread_root(apps, schema_editor):
+    """Point every existing reply at the root of its thread."""
+    Message = apps.get_model('messaging', 'Message')
+    parents = dict(Message.objects.values_list('id', 'parent_message_id'))
+
+    def find_root(message_id):
+        while parents.get(message_id):
+            message_id = parents[message_id]
+        return message_id
+
+    replies = [
+        Message(id=message_id, thread_root_id=find_root(message_id))
+        for message_id, parent_id in parents.items()
+        if parent_id
+    ]
+    Message.objects.bulk_update(replies, ['thread_root'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0004_notification_messaging_n_created_a9b879_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='thread_root',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Root message of the thread, kept in sync with parent_message', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread_descendants', to='messaging.message'),
+        ),
+        migrations.RunPython(backfill_thread_root, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:43
+
+from django.db import migrations, models
+
+
+def copy_read_to_is_read(apps, schema_editor):
+    """Carry messages only flagged through the dropped read column over to is_read."""
+    Message = apps.get_model('messaging', 'Message')
+    Message.objects.filter(read=True, is_read=False).update(is_read=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_message_thread_root'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_read_to_is_read, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='message',
+            name='messaging_m_receive_6da6d1_idx',
+        ),
+        migrations.RemoveField(
+            model_name='message',
+            name='read',
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['receiver', 'is_read'], name='messaging_m_receive_5b2f13_idx'),
+        ),
+    ]
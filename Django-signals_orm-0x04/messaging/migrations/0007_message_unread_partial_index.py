@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0006_merge_message_read_flags'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='message',
+            name='messaging_m_receive_5b2f13_idx',
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['receiver', '-timestamp'], name='msg_unread_recv_idx'),
+        ),
+    ]
@@ -2,27 +2,35 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.db.models import Q, Prefetch
+from django.db.models.functions import Substr
 from .managers import UnreadMessagesManager
 
 
+# Number of content characters loaded for each conversation preview
+CONVERSATION_PREVIEW_LENGTH = 140
+
+
 class Message(models.Model):
     """
     Message model to store messages between users with threaded conversation support.
     """
+    # sender, receiver and parent_message lead composite indexes in Meta,
+    # so their single-column FK indexes would only add write cost
     sender = models.ForeignKey(
         User, 
         on_delete=models.CASCADE, 
-        related_name='sent_messages'
+        related_name='sent_messages',
+        db_index=False
     )
     receiver = models.ForeignKey(
         User, 
         on_delete=models.CASCADE, 
-        related_name='received_messages'
+        related_name='received_messages',
+        db_index=False
     )
     content = models.TextField()
     timestamp = models.DateTimeField(default=timezone.now)
     is_read = models.BooleanField(default=False)
-    read = models.BooleanField(default=False)  # New field for unread messages
     edited = models.BooleanField(default=False)
     edited_at = models.DateTimeField(null=True, blank=True)
     
@@ -33,8 +41,18 @@ class Message(models.Model):
         related_name='replies',
         null=True,
         blank=True,
+        db_index=False,
         help_text='Parent message this is replying to'
     )
+    thread_root = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        related_name='thread_descendants',
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='Root message of the thread, kept in sync with parent_message'
+    )
     
     # Custom managers
     objects = models.Manager()
@@ -46,9 +64,17 @@ class Message(models.Model):
         verbose_name_plural = 'Messages'
         indexes = [
             models.Index(fields=['sender', 'receiver']),
-            models.Index(fields=['parent_message']),
             models.Index(fields=['timestamp']),
-            models.Index(fields=['receiver', 'read']),  # Index for unread queries
+            # Ordered scans for per-user listings and thread replies
+            models.Index(fields=['sender', '-timestamp'], name='msg_sender_ts_idx'),
+            models.Index(fields=['receiver', '-timestamp'], name='msg_recv_ts_idx'),
+            models.Index(fields=['parent_message', 'timestamp'], name='msg_parent_ts_idx'),
+            # Partial index for unread queries; read rows never enter it
+            models.Index(
+                fields=['receiver', '-timestamp'],
+                condition=Q(is_read=False),
+                name='msg_unread_recv_idx',
+            ),
         ]
     
     def __str__(self):
@@ -60,17 +86,24 @@ class Message(models.Model):
         """Return a shortened version of the message content."""
         return self.content[:50] + "..." if len(self.content) > 50 else self.content
     
+    @property
+    def read(self):
+        """Alias of is_read kept for backward compatibility."""
+        return self.is_read
+    
+    @read.setter
+    def read(self, value):
+        self.is_read = value
+    
     def mark_as_read(self):
         """Mark the message as read."""
-        self.read = True
         self.is_read = True
-        self.save(update_fields=['read', 'is_read'])
+        self.save(update_fields=['is_read'])
     
     def mark_as_unread(self):
         """Mark the message as unread."""
-        self.read = False
         self.is_read = False
-        self.save(update_fields=['read', 'is_read'])
+        self.save(update_fields=['is_read'])
     
     def mark_as_edited(self):
         """Mark the message as edited and update the edited_at timestamp."""
@@ -81,17 +114,19 @@ class Message(models.Model):
     @property
     def is_reply(self):
         """Check if this message is a reply to another message."""
-        return self.parent_message is not None
+        return self.parent_message_id is not None
     
     @property
     def is_thread_starter(self):
         """Check if this message starts a new thread."""
-        return self.parent_message is None
+        return self.parent_message_id is None
     
     def get_thread_root(self):
         """Get the root message of this thread."""
         if self.is_thread_starter:
             return self
+        if self.thread_root_id:
+            return self.thread_root
         return self.parent_message.get_thread_root()
     
     def get_reply_count(self):
@@ -122,12 +157,20 @@ class Message(models.Model):
     def get_thread_messages(self):
         """
         Get all messages in this thread (including the root message).
-        Returns a queryset with all messages ordered by timestamp.
+        Returns a queryset with all messages ordered by timestamp, with the
+        edit history of each message prefetched.
         """
-        root = self.get_thread_root()
+        root_id = self.thread_root_id or self.id
         return Message.objects.filter(
-            Q(id=root.id) | Q(parent_message=root)
-        ).select_related('sender', 'receiver', 'parent_message').order_by('timestamp')
+            Q(id=root_id) | Q(thread_root_id=root_id)
+        ).select_related('sender', 'receiver', 'parent_message').prefetch_related(
+            Prefetch(
+                'history',
+                queryset=MessageHistory.objects.only(
+                    'id', 'message', 'old_content', 'edited_at'
+                ).order_by('-edited_at')
+            )
+        ).order_by('timestamp')
     
     @classmethod
     def get_conversation_threads(cls, user1, user2):
@@ -150,11 +193,17 @@ class Message(models.Model):
         """
         Get all conversations for a user with optimized queries.
         Returns a queryset with thread starter messages.
+        The full content is deferred; use the ``preview`` annotation instead.
         """
         return cls.objects.filter(
             Q(sender=user) | Q(receiver=user),
             parent_message__isnull=True  # Only thread starters
-        ).select_related('sender', 'receiver').prefetch_related(
+        ).select_related('sender', 'receiver').annotate(
+            preview=Substr('content', 1, CONVERSATION_PREVIEW_LENGTH)
+        ).only(
+            'id', 'sender__id', 'sender__username', 'receiver__id', 'receiver__username',
+            'timestamp', 'is_read', 'parent_message'
+        ).prefetch_related(
             Prefetch(
                 'replies',
                 queryset=cls.objects.select_related('sender', 'receiver').order_by('timestamp')
@@ -163,12 +212,13 @@ class Message(models.Model):
     
     def can_reply(self, user):
         """Check if a user can reply to this message."""
-        return user in [self.sender, self.receiver]
+        # Compare ids so neither participant has to be loaded
+        return user.pk in (self.sender_id, self.receiver_id)
     
     def get_participants(self):
         """Get all participants in this thread."""
         participants = {self.sender, self.receiver}
-        for reply in self.replies.all():
+        for reply in self.replies.select_related('sender', 'receiver'):
             participants.add(reply.sender)
             participants.add(reply.receiver)
         return participants
@@ -241,6 +291,9 @@ class Notification(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return f"Notification for {self.user.username}: {self.title}"
@@ -1,48 +1,36 @@
-from django.db.models.signals import post_save, pre_save, post_delete
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.contrib.auth.models import User
 from django.utils import timezone
-from django.db import transaction
+from django.core.cache import cache
+from .managers import conversations_cache_key
 from .models import Message, Notification, MessageHistory
 
 
-@receiver(post_delete, sender=User)
-def cleanup_user_data(sender, instance, **kwargs):
+@receiver(pre_save, sender=Message)
+def set_thread_root(sender, instance, **kwargs):
+    """
+    Signal to keep the denormalized thread_root in sync with parent_message.
+    
+    Replies inherit the root of their parent, so finding the root of a thread
+    never has to walk the parent_message chain.
     """
-    Signal to automatically clean up all data associated with a deleted user.
+    # Partial saves that leave parent_message alone (e.g. mark_as_read) keep the root
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'parent_message' not in update_fields:
+        return
     
-    This signal is triggered after a User instance is deleted. It ensures that
-    all related data (messages, notifications, message history) is properly cleaned up.
-    Note: This is a backup cleanup mechanism. The main cleanup happens in the view.
-    """
-    try:
-        with transaction.atomic():
-            # Clean up messages sent by the deleted user
-            sent_messages = Message.objects.filter(sender=instance)
-            sent_count = sent_messages.count()
-            sent_messages.delete()
-            
-            # Clean up messages received by the deleted user
-            received_messages = Message.objects.filter(receiver=instance)
-            received_count = received_messages.count()
-            received_messages.delete()
-            
-            # Clean up notifications for the deleted user
-            notifications = Notification.objects.filter(user=instance)
-            notification_count = notifications.count()
-            notifications.delete()
-            
-            # Clean up message history edits by the deleted user
-            message_edits = MessageHistory.objects.filter(edited_by=instance)
-            edit_count = message_edits.count()
-            message_edits.delete()
-            
-            print(f"User {instance.username} deleted. Cleaned up: "
-                  f"{sent_count} sent messages, {received_count} received messages, "
-                  f"{notification_count} notifications, {edit_count} message edits")
-                  
-    except Exception as e:
-        print(f"Error cleaning up data for deleted user {instance.username}: {str(e)}")
+    if not instance.parent_message_id:
+        instance.thread_root_id = None
+        return
+    
+    if Message.parent_message.is_cached(instance):
+        parent_root_id = instance.parent_message.thread_root_id
+    else:
+        # Only the parent's root is needed, not the whole parent row
+        parent_root_id = Message.objects.filter(
+            pk=instance.parent_message_id
+        ).values_list('thread_root_id', flat=True).first()
+    instance.thread_root_id = parent_root_id or instance.parent_message_id
 
 
 @receiver(pre_save, sender=Message)
@@ -54,23 +42,22 @@ def log_message_edit(sender, instance, **kwargs):
     already exists and the content has changed, it creates a MessageHistory record.
     """
     if instance.pk:  # Only for existing messages (not new ones)
-        try:
-            old_instance = Message.objects.get(pk=instance.pk)
-            if old_instance.content != instance.content:
-                # Content has changed, log the old version
-                MessageHistory.objects.create(
-                    message=instance,
-                    old_content=old_instance.content,
-                    edited_by=instance.sender,  # Assuming the sender is editing
-                    edited_at=timezone.now()
-                )
-                # Mark the message as edited
-                instance.edited = True
-                instance.edited_at = timezone.now()
-                print(f"Message edit logged for message {instance.pk} by {instance.sender.username}")
-        except Message.DoesNotExist:
-            # This shouldn't happen, but handle it gracefully
-            pass
+        # Only the stored content is needed for the comparison
+        old_content = Message.objects.filter(pk=instance.pk).values_list(
+            'content', flat=True
+        ).first()
+        if old_content is not None and old_content != instance.content:
+            # Content has changed, log the old version
+            MessageHistory.objects.create(
+                message=instance,
+                old_content=old_content,
+                edited_by=instance.sender,  # Assuming the sender is editing
+                edited_at=timezone.now()
+            )
+            # Mark the message as edited
+            instance.edited = True
+            instance.edited_at = timezone.now()
+            print(f"Message edit logged for message {instance.pk} by {instance.sender.username}")
 
 
 @receiver(post_save, sender=Message)
@@ -137,6 +124,36 @@ def update_message_read_status(sender, instance, **kwargs):
         ).update(is_read=True)
 
 
+@receiver(post_save, sender=Message)
+def invalidate_conversation_cache(sender, instance, **kwargs):
+    """
+    Signal to drop the cached conversation lists of both participants
+    whenever a message is created or changed.
+    """
+    cache.delete_many([
+        conversations_cache_key(instance.sender_id),
+        conversations_cache_key(instance.receiver_id),
+    ])
+
+
+@receiver(post_save, sender=Message)
+def invalidate_unread_count(sender, instance, **kwargs):
+    """
+    Signal to drop the receiver's cached unread count whenever a message
+    is created or its read status may have changed.
+    """
+    Message.unread.invalidate_count(instance.receiver_id)
+
+
+@receiver(post_delete, sender=Message)
+def invalidate_read_state_on_delete(sender, instance, **kwargs):
+    """
+    Signal to drop the cached conversation lists and unread counts of both
+    participants when a message is deleted, including by a user's CASCADE.
+    """
+    Message.unread.invalidate_read_state(instance.sender_id, instance.receiver_id)
+
+
 def create_system_notification(user, title, content):
     """
     Utility function to create system notifications.
@@ -145,8 +162,11 @@ def create_system_notification(user, title, content):
         user: The user to notify
         title: The notification title
         content: The notification content
+    
+    Returns:
+        The created Notification instance
     """
-    Notification.objects.create(
+    return Notification.objects.create(
         user=user,
         notification_type='system',
         title=title,
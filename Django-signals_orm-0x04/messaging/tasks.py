@@ -0,0 +1,17 @@
+"""
+Long-running jobs for the messaging app.
+
+Each job is a plain function that takes primitive arguments only, so it can
+be handed to a task queue (Celery, RQ, ...) without changes.
+"""
+from django.contrib.auth import get_user_model
+
+
+def cascade_delete_user(user_id):
+    """
+    Delete a user and, through the CASCADE foreign keys, all of their
+    messages, notifications and message history.
+    
+    Returns the (total, per-model) counts reported by QuerySet.delete().
+    """
+    return get_user_model().objects.filter(pk=user_id).delete()
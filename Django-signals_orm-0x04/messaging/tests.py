@@ -1,29 +1,119 @@
-from django.test import TestCase
+from contextlib import ExitStack, contextmanager
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth.models import User
+from django.contrib.auth.hashers import make_password
 from django.utils import timezone
-from django.db import transaction
+from django.db import connection, transaction
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from .managers import CONVERSATIONS_CACHE_TIMEOUT, conversations_cache_key
 from .models import Message, Notification, MessageHistory
-from .signals import create_system_notification
-from django.test import Client
+from .signals import (
+    create_system_notification,
+    create_message_notification,
+    handle_message_edit,
+    update_message_read_status,
+)
 from django.urls import reverse
 
 
-class MessageModelTest(TestCase):
-    """Test cases for the Message model."""
+# post_save receivers that only write Notification rows, in connection order
+NOTIFICATION_RECEIVERS = (
+    create_message_notification,
+    handle_message_edit,
+    update_message_read_status,
+)
+
+# Columns touched by an edit; the pre_save receiver fills in edited/edited_at
+EDIT_FIELDS = ['content', 'edited', 'edited_at']
+
+# Over-length contents for the get_short_*content() truncation tests
+LONG_CONTENT = (
+    'This is a very long message that should be truncated when displayed '
+    'in the admin interface or other places where space is limited.'
+)
+LONG_CONTENT_TRUNCATED = LONG_CONTENT[:50] + '...'
+LONG_OLD_CONTENT = (
+    'This is a very long old content that should be truncated when displayed '
+    'in the admin interface or other places where space is limited.'
+)
+LONG_OLD_CONTENT_TRUNCATED = LONG_OLD_CONTENT[:50] + '...'
+
+# Computed once at import; make_password(None) skips the hasher entirely
+UNUSABLE_PASSWORD = make_password(None)
+
+
+def _ensure_user(username):
+    """Return the test user called ``username``, creating it on first use."""
+    return User.objects.get_or_create(
+        username=username,
+        defaults={
+            'email': f'{username}@example.com',
+            'password': UNUSABLE_PASSWORD,
+        },
+    )[0]
+
+
+@contextmanager
+def no_message_signals():
+    """Disconnect the Message notification receivers for the duration of the block."""
+    for receiver_func in NOTIFICATION_RECEIVERS:
+        post_save.disconnect(receiver=receiver_func, sender=Message)
+    try:
+        yield
+    finally:
+        for receiver_func in NOTIFICATION_RECEIVERS:
+            post_save.connect(receiver_func, sender=Message)
+
+
+class NoMessageSignalsMixin:
+    """Run every test of the class without the notification receivers."""
     
     def setUp(self):
-        """Set up test data."""
-        self.user1 = User.objects.create_user(
-            username='testuser1',
-            email='test1@example.com',
-            password='testpass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='testuser2',
-            email='test2@example.com',
-            password='testpass123'
+        super().setUp()
+        stack = ExitStack()
+        stack.enter_context(no_message_signals())
+        self.addCleanup(stack.close)
+
+
+class MessagePurePythonTest(SimpleTestCase):
+    """Test cases for Message methods that need no database."""
+    
+    def setUp(self):
+        """Set up unsaved users and a message."""
+        self.user1 = User(username='testuser1')
+        self.user2 = User(username='testuser2')
+        self.message = Message(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Short message',
+            timestamp=timezone.now()
         )
     
+    def test_message_str_representation(self):
+        """Test the string representation of a message."""
+        expected_str = f"Message from {self.user1.username} to {self.user2.username} at {self.message.timestamp}"
+        self.assertEqual(str(self.message), expected_str)
+    
+    def test_get_short_content(self):
+        """Test the get_short_content method."""
+        # Test with short content
+        self.assertEqual(self.message.get_short_content(), 'Short message')
+        
+        # Test with long content
+        self.message.content = LONG_CONTENT
+        self.assertEqual(self.message.get_short_content(), LONG_CONTENT_TRUNCATED)
+
+
+class MessageModelTest(NoMessageSignalsMixin, TestCase):
+    """Test cases for the Message model."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
+    
     def test_message_creation(self):
         """Test creating a message."""
         message = Message.objects.create(
@@ -40,35 +130,37 @@ class MessageModelTest(TestCase):
         self.assertIsNone(message.edited_at)
         self.assertIsNotNone(message.timestamp)
     
-    def test_message_str_representation(self):
-        """Test the string representation of a message."""
+    def test_message_methods(self):
+        """Test the Message helper methods on a single message."""
         message = Message.objects.create(
-            sender=self.user1,
-            receiver=self.user2,
-            content='Test message'
-        )
-        
-        expected_str = f"Message from {self.user1.username} to {self.user2.username} at {message.timestamp}"
-        self.assertEqual(str(message), expected_str)
-    
-    def test_get_short_content(self):
-        """Test the get_short_content method."""
-        # Test with short content
-        message1 = Message.objects.create(
             sender=self.user1,
             receiver=self.user2,
             content='Short message'
         )
-        self.assertEqual(message1.get_short_content(), 'Short message')
         
-        # Test with long content
-        long_content = 'This is a very long message that should be truncated when displayed in the admin interface or other places where space is limited.'
-        message2 = Message.objects.create(
-            sender=self.user1,
-            receiver=self.user2,
-            content=long_content
-        )
-        self.assertEqual(message2.get_short_content(), 'This is a very long message that should be truncat...')
+        with self.subTest('edited'):
+            self.assertFalse(message.edited)
+            self.assertIsNone(message.edited_at)
+            
+            message.mark_as_edited()
+            
+            self.assertTrue(message.edited)
+            self.assertIsNotNone(message.edited_at)
+        
+        with self.subTest('read'):
+            self.assertFalse(message.read)
+            self.assertFalse(message.is_read)
+            
+            message.mark_as_read()
+            
+            self.assertTrue(message.read)
+            self.assertTrue(message.is_read)
+        
+        with self.subTest('unread'):
+            message.mark_as_unread()
+            
+            self.assertFalse(message.read)
+            self.assertFalse(message.is_read)
     
     def test_message_ordering(self):
         """Test that messages are ordered by timestamp (chronological order)."""
@@ -86,78 +178,22 @@ class MessageModelTest(TestCase):
         messages = Message.objects.all()
         self.assertEqual(messages[0], message1)  # First message (chronological)
         self.assertEqual(messages[1], message2)  # Second message (chronological)
-    
-    def test_mark_as_edited(self):
-        """Test marking a message as edited."""
-        message = Message.objects.create(
-            sender=self.user1,
-            receiver=self.user2,
-            content='Original message'
-        )
-        
-        self.assertFalse(message.edited)
-        self.assertIsNone(message.edited_at)
-        
-        message.mark_as_edited()
-        
-        self.assertTrue(message.edited)
-        self.assertIsNotNone(message.edited_at)
-    
-    def test_mark_as_read(self):
-        """Test marking a message as read."""
-        message = Message.objects.create(
-            sender=self.user1,
-            receiver=self.user2,
-            content='Test message'
-        )
-        
-        self.assertFalse(message.read)
-        self.assertFalse(message.is_read)
-        
-        message.mark_as_read()
-        
-        self.assertTrue(message.read)
-        self.assertTrue(message.is_read)
-    
-    def test_mark_as_unread(self):
-        """Test marking a message as unread."""
-        message = Message.objects.create(
-            sender=self.user1,
-            receiver=self.user2,
-            content='Test message',
-            read=True,
-            is_read=True
-        )
-        
-        self.assertTrue(message.read)
-        self.assertTrue(message.is_read)
-        
-        message.mark_as_unread()
-        
-        self.assertFalse(message.read)
-        self.assertFalse(message.is_read)
 
 
-class MessageHistoryModelTest(TestCase):
+class MessageHistoryModelTest(NoMessageSignalsMixin, TestCase):
     """Test cases for the MessageHistory model."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user1 = User.objects.create_user(
-            username='testuser1',
-            email='test1@example.com',
-            password='testpass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='testuser2',
-            email='test2@example.com',
-            password='testpass123'
-        )
-        self.message = Message.objects.create(
-            sender=self.user1,
-            receiver=self.user2,
-            content='Original message content'
-        )
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
+        with no_message_signals():
+            cls.message = Message.objects.create(
+                sender=cls.user1,
+                receiver=cls.user2,
+                content='Original message content'
+            )
     
     def test_message_history_creation(self):
         """Test creating a message history record."""
@@ -194,13 +230,12 @@ class MessageHistoryModelTest(TestCase):
         self.assertEqual(history1.get_short_old_content(), 'Short old content')
         
         # Test with long content
-        long_content = 'This is a very long old content that should be truncated when displayed in the admin interface or other places where space is limited.'
         history2 = MessageHistory.objects.create(
             message=self.message,
-            old_content=long_content,
+            old_content=LONG_OLD_CONTENT,
             edited_by=self.user1
         )
-        self.assertEqual(history2.get_short_old_content(), 'This is a very long old content that should be tru...')
+        self.assertEqual(history2.get_short_old_content(), LONG_OLD_CONTENT_TRUNCATED)
     
     def test_message_history_ordering(self):
         """Test that message history is ordered by edited_at (newest first)."""
@@ -223,18 +258,11 @@ class MessageHistoryModelTest(TestCase):
 class MessageEditSignalTest(TestCase):
     """Test cases for message editing signals."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user1 = User.objects.create_user(
-            username='testuser1',
-            email='test1@example.com',
-            password='testpass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='testuser2',
-            email='test2@example.com',
-            password='testpass123'
-        )
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
     
     def test_message_edit_creates_history(self):
         """Test that editing a message creates a history record."""
@@ -254,7 +282,7 @@ class MessageEditSignalTest(TestCase):
         # Check that a history record was created
         self.assertEqual(MessageHistory.objects.count(), initial_history_count + 1)
         
-        history = MessageHistory.objects.latest('edited_at')
+        history = MessageHistory.objects.select_related('message', 'edited_by').latest('edited_at')
         self.assertEqual(history.message, message)
         self.assertEqual(history.old_content, 'Original message')
         self.assertEqual(history.edited_by, self.user1)
@@ -307,7 +335,9 @@ class MessageEditSignalTest(TestCase):
         # Check that an edit notification was created
         self.assertEqual(Notification.objects.count(), initial_notification_count + 1)
         
-        notification = Notification.objects.latest('created_at')
+        notification = Notification.objects.filter(
+            message=message, notification_type='edit'
+        ).only('title', 'notification_type', 'user_id', 'message_id', 'content').first()
         self.assertEqual(notification.user, self.user2)
         self.assertEqual(notification.message, message)
         self.assertEqual(notification.notification_type, 'edit')
@@ -323,21 +353,23 @@ class MessageEditSignalTest(TestCase):
         
         # First edit
         message.content = 'First edit'
-        message.save()
+        message.save(update_fields=EDIT_FIELDS)
         
         # Second edit
         message.content = 'Second edit'
-        message.save()
+        message.save(update_fields=EDIT_FIELDS)
         
         # Third edit
         message.content = 'Third edit'
-        message.save()
+        message.save(update_fields=EDIT_FIELDS)
         
         # Check that three history records were created
         self.assertEqual(MessageHistory.objects.count(), 3)
         
         # Check the history records
-        history_records = MessageHistory.objects.filter(message=message).order_by('edited_at')
+        history_records = list(
+            MessageHistory.objects.select_related('edited_by').filter(message=message).order_by('edited_at')
+        )
         self.assertEqual(history_records[0].old_content, 'Original message')
         self.assertEqual(history_records[1].old_content, 'First edit')
         self.assertEqual(history_records[2].old_content, 'Second edit')
@@ -346,18 +378,11 @@ class MessageEditSignalTest(TestCase):
 class NotificationModelTest(TestCase):
     """Test cases for the Notification model."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
-        )
-        self.sender = User.objects.create_user(
-            username='sender',
-            email='sender@example.com',
-            password='testpass123'
-        )
+        cls.user = _ensure_user('testuser')
+        cls.sender = _ensure_user('sender')
     
     def test_notification_creation(self):
         """Test creating a notification."""
@@ -463,18 +488,11 @@ class NotificationModelTest(TestCase):
 class SignalTest(TestCase):
     """Test cases for Django signals."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user1 = User.objects.create_user(
-            username='testuser1',
-            email='test1@example.com',
-            password='testpass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='testuser2',
-            email='test2@example.com',
-            password='testpass123'
-        )
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
     
     def test_message_creation_triggers_notification(self):
         """Test that creating a message automatically creates a notification."""
@@ -490,7 +508,9 @@ class SignalTest(TestCase):
         # Check that a notification was created
         self.assertEqual(Notification.objects.count(), initial_notification_count + 1)
         
-        notification = Notification.objects.latest('created_at')
+        notification = Notification.objects.filter(
+            message=message
+        ).only('title', 'notification_type', 'user_id', 'message_id', 'content').first()
         self.assertEqual(notification.user, self.user2)
         self.assertEqual(notification.message, message)
         self.assertEqual(notification.notification_type, 'message')
@@ -536,46 +556,44 @@ class SignalTest(TestCase):
     
     def test_system_notification_creation(self):
         """Test the create_system_notification utility function."""
-        from .signals import create_system_notification
-        
-        initial_notification_count = Notification.objects.count()
-        
-        create_system_notification(
+        notification = create_system_notification(
             user=self.user1,
             title='System Update',
             content='This is a system notification.'
         )
         
-        self.assertEqual(Notification.objects.count(), initial_notification_count + 1)
-        
-        notification = Notification.objects.latest('created_at')
+        self.assertIsNotNone(notification.pk)
         self.assertEqual(notification.user, self.user1)
         self.assertEqual(notification.notification_type, 'system')
         self.assertEqual(notification.title, 'System Update')
         self.assertEqual(notification.content, 'This is a system notification.')
         self.assertFalse(notification.is_read)
+    
+    def test_message_delete_drops_cached_conversation_lists(self):
+        """Test that deleting a message invalidates both participants' conversation lists."""
+        message = Message.objects.create(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Test message'
+        )
+        cache.set(conversations_cache_key(self.user1.pk), [message.pk], CONVERSATIONS_CACHE_TIMEOUT)
+        cache.set(conversations_cache_key(self.user2.pk), [message.pk], CONVERSATIONS_CACHE_TIMEOUT)
+        
+        message.delete()
+        
+        self.assertIsNone(cache.get(conversations_cache_key(self.user1.pk)))
+        self.assertIsNone(cache.get(conversations_cache_key(self.user2.pk)))
 
 
 class IntegrationTest(TestCase):
     """Integration tests for the messaging system."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user1 = User.objects.create_user(
-            username='alice',
-            email='alice@example.com',
-            password='testpass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='bob',
-            email='bob@example.com',
-            password='testpass123'
-        )
-        self.user3 = User.objects.create_user(
-            username='charlie',
-            email='charlie@example.com',
-            password='testpass123'
-        )
+        cls.user1 = _ensure_user('alice')
+        cls.user2 = _ensure_user('bob')
+        cls.user3 = _ensure_user('charlie')
     
     def test_complete_messaging_flow(self):
         """Test a complete messaging flow with notifications."""
@@ -657,30 +675,33 @@ class IntegrationTest(TestCase):
         
         # Edit the message multiple times
         message.content = 'First edit'
-        message.save()
+        message.save(update_fields=EDIT_FIELDS)
         
         message.content = 'Second edit'
-        message.save()
+        message.save(update_fields=EDIT_FIELDS)
         
         message.content = 'Final version'
-        message.save()
+        message.save(update_fields=EDIT_FIELDS)
         
         # Check that history records were created
-        history_records = MessageHistory.objects.filter(message=message)
-        self.assertEqual(history_records.count(), 3)
+        history_list = list(
+            MessageHistory.objects.select_related('edited_by').filter(message=message).order_by('edited_at')
+        )
+        self.assertEqual(len(history_list), 3)
         
         # Check the content of history records
-        history_list = list(history_records.order_by('edited_at'))
         self.assertEqual(history_list[0].old_content, 'Original message content')
         self.assertEqual(history_list[1].old_content, 'First edit')
         self.assertEqual(history_list[2].old_content, 'Second edit')
         
         # Check that edit notifications were created (3 edits = 3 edit notifications)
-        edit_notifications = Notification.objects.filter(
-            message=message,
-            notification_type='edit'
+        edit_notifications = list(
+            Notification.objects.select_related('user').filter(
+                message=message,
+                notification_type='edit'
+            )
         )
-        self.assertEqual(edit_notifications.count(), 3)
+        self.assertEqual(len(edit_notifications), 3)
         
         # Check that all edit notifications are for the receiver
         for notification in edit_notifications:
@@ -736,105 +757,49 @@ class IntegrationTest(TestCase):
         # Delete user1
         self.user1.delete()
         
-        # Check that user1 and all their data is deleted
-        self.assertEqual(User.objects.count(), 2)
-        self.assertEqual(Message.objects.count(), 1)  # Only message3 remains
-        # Notifications that reference deleted messages are deleted via CASCADE
-        # But system notifications without message references may remain
-        remaining_notifications = Notification.objects.count()
-        self.assertEqual(MessageHistory.objects.count(), 0)  # All history deleted
+        # Fetch every post-deletion figure in a single round-trip
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT
+                    (SELECT COUNT(*) FROM {User._meta.db_table}),
+                    (SELECT COUNT(*) FROM {Message._meta.db_table}),
+                    (SELECT COUNT(*) FROM {MessageHistory._meta.db_table}),
+                    (SELECT sender_id FROM {Message._meta.db_table} LIMIT 1),
+                    (SELECT receiver_id FROM {Message._meta.db_table} LIMIT 1),
+                    (SELECT COUNT(*) FROM {Notification._meta.db_table}),
+                    (SELECT COUNT(*) FROM {Notification._meta.db_table}
+                     WHERE user_id NOT IN (%s, %s))
+                """,
+                [self.user2.pk, self.user3.pk]
+            )
+            (users, messages, history, sender_id, receiver_id,
+             notifications, foreign_notifications) = cursor.fetchone()
         
-        # Check that other users still exist
-        self.assertTrue(User.objects.filter(username='bob').exists())
-        self.assertTrue(User.objects.filter(username='charlie').exists())
+        # Check that user1 and all their data is deleted
+        self.assertEqual(users, 2)  # Only bob and charlie remain
+        self.assertEqual(messages, 1)  # Only message3 remains
+        self.assertEqual(history, 0)  # All history deleted
         
         # Check that remaining data is intact
-        remaining_message = Message.objects.first()
-        self.assertEqual(remaining_message.sender, self.user2)
-        self.assertEqual(remaining_message.receiver, self.user3)
-        
-        # Check that there are remaining notifications (could be for any remaining user)
-        remaining_notifications = Notification.objects.all()
-        self.assertGreater(remaining_notifications.count(), 0)
-        # The remaining notifications should be for user2 or user3
-        for notification in remaining_notifications:
-            self.assertIn(notification.user, [self.user2, self.user3])
+        self.assertEqual(sender_id, self.user2.pk)
+        self.assertEqual(receiver_id, self.user3.pk)
+        
+        # Notifications that reference deleted messages are deleted via CASCADE;
+        # the remaining ones should be for user2 or user3
+        self.assertGreater(notifications, 0)
+        self.assertEqual(foreign_notifications, 0)
 
 
 class UserDeletionTest(TestCase):
     """Test cases for user deletion and data cleanup."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user1 = User.objects.create_user(
-            username='testuser1',
-            email='test1@example.com',
-            password='testpass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='testuser2',
-            email='test2@example.com',
-            password='testpass123'
-        )
-        self.user3 = User.objects.create_user(
-            username='testuser3',
-            email='test3@example.com',
-            password='testpass123'
-        )
-    
-    def test_user_deletion_cleans_up_messages(self):
-        """Test that deleting a user cleans up all related messages."""
-        # Create messages involving the user
-        message1 = Message.objects.create(
-            sender=self.user1,
-            receiver=self.user2,
-            content='Message from user1 to user2'
-        )
-        message2 = Message.objects.create(
-            sender=self.user2,
-            receiver=self.user1,
-            content='Message from user2 to user1'
-        )
-        message3 = Message.objects.create(
-            sender=self.user2,
-            receiver=self.user3,
-            content='Message from user2 to user3'
-        )
-        
-        # Create notifications
-        notification1 = Notification.objects.create(
-            user=self.user1,
-            message=message1,
-            notification_type='message',
-            title='Test notification'
-        )
-        
-        # Create message history
-        history = MessageHistory.objects.create(
-            message=message1,
-            old_content='Old content',
-            edited_by=self.user1
-        )
-        
-        # Check initial counts
-        self.assertEqual(Message.objects.count(), 3)
-        # Note: Notifications are automatically created by signals when messages are created
-        initial_notification_count = Notification.objects.count()
-        self.assertEqual(MessageHistory.objects.count(), 1)
-        
-        # Delete user1
-        self.user1.delete()
-        
-        # Check that user1's data is cleaned up
-        self.assertEqual(Message.objects.count(), 1)  # Only message3 remains
-        # Notifications that reference deleted messages are deleted via CASCADE
-        # But system notifications without message references remain
-        remaining_notifications = Notification.objects.count()
-        self.assertEqual(MessageHistory.objects.count(), 0)  # All history deleted
-        
-        # Check that user2 and user3 still exist
-        self.assertTrue(User.objects.filter(username='testuser2').exists())
-        self.assertTrue(User.objects.filter(username='testuser3').exists())
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
+        cls.user3 = _ensure_user('testuser3')
     
     def test_user_deletion_cleans_up_notifications(self):
         """Test that deleting a user cleans up all their notifications."""
@@ -899,19 +864,11 @@ class UserDeletionTest(TestCase):
 class AccountDeletionViewTest(TestCase):
     """Test cases for account deletion views."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
-        )
-        self.other_user = User.objects.create_user(
-            username='otheruser',
-            email='other@example.com',
-            password='testpass123'
-        )
+        cls.user = _ensure_user('testuser')
+        cls.other_user = _ensure_user('otheruser')
     
     def test_delete_account_confirm_view_requires_login(self):
         """Test that delete account confirm view requires login."""
@@ -920,14 +877,14 @@ class AccountDeletionViewTest(TestCase):
     
     def test_delete_account_confirm_view_with_login(self):
         """Test delete account confirm view with logged in user."""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         response = self.client.get(reverse('messaging:delete_account_confirm'))
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Delete Account')
     
     def test_delete_account_confirm_view_shows_user_stats(self):
         """Test that delete account confirm view shows user statistics."""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Create some data for the user
         Message.objects.create(
@@ -953,13 +910,13 @@ class AccountDeletionViewTest(TestCase):
     
     def test_delete_account_view_requires_post(self):
         """Test that delete account view requires POST method."""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         response = self.client.get(reverse('messaging:delete_account'))
         self.assertEqual(response.status_code, 405)  # Method not allowed
     
     def test_delete_account_view_deletes_user_and_data(self):
         """Test that delete account view properly deletes user and all data."""
-        self.client.login(username='testuser', password='testpass123')
+        self.client.force_login(self.user)
         
         # Create some data for the user
         message1 = Message.objects.create(
@@ -1017,23 +974,12 @@ class AccountDeletionViewTest(TestCase):
 class UnreadMessagesTest(TestCase):
     """Test cases for unread messages functionality."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user1 = User.objects.create_user(
-            username='testuser1',
-            email='test1@example.com',
-            password='testpass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='testuser2',
-            email='test2@example.com',
-            password='testpass123'
-        )
-        self.user3 = User.objects.create_user(
-            username='testuser3',
-            email='test3@example.com',
-            password='testpass123'
-        )
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
+        cls.user3 = _ensure_user('testuser3')
     
     def test_unread_messages_manager_for_user(self):
         """Test the UnreadMessagesManager.for_user method."""
@@ -1094,6 +1040,21 @@ class UnreadMessagesTest(TestCase):
         unread_count = Message.unread.count_for_user(self.user2)
         self.assertEqual(unread_count, 2)
     
+    def test_unread_count_drops_when_sender_is_deleted(self):
+        """Test that the cached unread count follows messages removed by a user's CASCADE."""
+        sender = _ensure_user('departing_sender')
+        Message.objects.create(
+            sender=sender,
+            receiver=self.user2,
+            content='Unread message',
+            read=False
+        )
+        self.assertEqual(Message.unread.count_for_user(self.user2), 1)
+        
+        sender.delete()
+        
+        self.assertEqual(Message.unread.count_for_user(self.user2), 0)
+    
     def test_unread_messages_manager_optimization(self):
         """Test that the unread messages manager uses optimized queries."""
         # Create unread messages
@@ -1144,19 +1105,11 @@ class UnreadMessagesTest(TestCase):
 class UnreadMessagesViewTest(TestCase):
     """Test cases for unread messages views."""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data."""
-        self.user1 = User.objects.create_user(
-            username='testuser1',
-            email='test1@example.com',
-            password='testpass123'
-        )
-        self.user2 = User.objects.create_user(
-            username='testuser2',
-            email='test2@example.com',
-            password='testpass123'
-        )
-        self.client = Client()
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
     
     def test_unread_messages_view_requires_login(self):
         """Test that unread messages view requires login."""
@@ -1165,7 +1118,7 @@ class UnreadMessagesViewTest(TestCase):
     
     def test_unread_messages_view_with_login(self):
         """Test unread messages view with authenticated user."""
-        self.client.login(username='testuser1', password='testpass123')
+        self.client.force_login(self.user1)
         
         # Create unread messages
         Message.objects.create(
@@ -1188,9 +1141,29 @@ class UnreadMessagesViewTest(TestCase):
         self.assertContains(response, 'Unread message 2')
         self.assertContains(response, '2')  # unread count
     
+    def test_unread_messages_api(self):
+        """Test the JSON unread messages endpoint."""
+        self.client.force_login(self.user1)
+        
+        message = Message.objects.create(
+            sender=self.user2,
+            receiver=self.user1,
+            content='Unread message 1'
+        )
+        
+        response = self.client.get(reverse('messaging:unread_messages_api'))
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['unread_count'], 1)
+        self.assertEqual(len(data['unread']), 1)
+        self.assertEqual(data['unread'][0]['id'], message.id)
+        self.assertEqual(data['unread'][0]['sender__username'], self.user2.username)
+        self.assertEqual(data['unread'][0]['content'], 'Unread message 1')
+    
     def test_mark_message_read_view(self):
         """Test marking a specific message as read."""
-        self.client.login(username='testuser1', password='testpass123')
+        self.client.force_login(self.user1)
         
         message = Message.objects.create(
             sender=self.user2,
@@ -1198,6 +1171,7 @@ class UnreadMessagesViewTest(TestCase):
             content='Unread message',
             read=False
         )
+        cache.set(conversations_cache_key(self.user2.pk), [], CONVERSATIONS_CACHE_TIMEOUT)
         
         response = self.client.post(
             reverse('messaging:mark_message_read', args=[message.id])
@@ -1205,15 +1179,54 @@ class UnreadMessagesViewTest(TestCase):
         
         self.assertEqual(response.status_code, 200)
         self.assertJSONEqual(response.content, {'success': True})
+        self.assertIsNone(cache.get(conversations_cache_key(self.user2.pk)))
         
         # Check that message is now read
         message.refresh_from_db()
         self.assertTrue(message.read)
         self.assertTrue(message.is_read)
+        
+        # Check that the related notification was marked as read too
+        self.assertFalse(
+            Notification.objects.filter(message=message, is_read=False).exists()
+        )
+    
+    def test_mark_message_read_view_other_user(self):
+        """Test that users cannot mark a message sent to someone else as read."""
+        self.client.force_login(self.user1)
+        message = Message.objects.create(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Unread message'
+        )
+        
+        response = self.client.post(
+            reverse('messaging:mark_message_read', args=[message.id])
+        )
+        
+        self.assertEqual(response.status_code, 404)
+        message.refresh_from_db()
+        self.assertFalse(message.is_read)
+    
+    def test_mark_message_read_view_requires_login(self):
+        """Test that anonymous requests get a 401 instead of a login redirect."""
+        message = Message.objects.create(
+            sender=self.user2,
+            receiver=self.user1,
+            content='Unread message'
+        )
+        
+        response = self.client.post(
+            reverse('messaging:mark_message_read', args=[message.id])
+        )
+        
+        self.assertEqual(response.status_code, 401)
+        message.refresh_from_db()
+        self.assertFalse(message.is_read)
     
     def test_mark_all_messages_read_view(self):
         """Test marking all unread messages as read."""
-        self.client.login(username='testuser1', password='testpass123')
+        self.client.force_login(self.user1)
         
         # Create unread messages
         Message.objects.create(
@@ -1229,10 +1242,180 @@ class UnreadMessagesViewTest(TestCase):
             read=False
         )
         
+        # Prime the cached unread count and conversation list so the view has to invalidate them
+        self.assertEqual(Message.unread.count_for_user(self.user1), 2)
+        cache.set(conversations_cache_key(self.user1.pk), [], CONVERSATIONS_CACHE_TIMEOUT)
+        cache.set(conversations_cache_key(self.user2.pk), [], CONVERSATIONS_CACHE_TIMEOUT)
+        
         response = self.client.post(reverse('messaging:mark_all_messages_read'))
         
         self.assertEqual(response.status_code, 302)  # Redirect
+        self.assertIsNone(cache.get(conversations_cache_key(self.user1.pk)))
+        # The sender's list shows the read state as well
+        self.assertIsNone(cache.get(conversations_cache_key(self.user2.pk)))
         
         # Check that all messages are now read
         unread_count = Message.unread.count_for_user(self.user1)
-        self.assertEqual(unread_count, 0) 
\ No newline at end of file
+        self.assertEqual(unread_count, 0)
+        
+        # Check that their notifications were marked as read too
+        self.assertFalse(
+            Notification.objects.filter(user=self.user1, is_read=False).exists()
+        )
+
+
+class ThreadedMessageTest(TestCase):
+    """Test cases for threaded replies."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
+    
+    def test_replies_share_thread_root(self):
+        """Test that nested replies point at the root of their thread."""
+        root = Message.objects.create(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Root message'
+        )
+        reply = Message.objects.create(
+            sender=self.user2,
+            receiver=self.user1,
+            content='Reply',
+            parent_message=root
+        )
+        nested_reply = Message.objects.create(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Nested reply',
+            parent_message=reply
+        )
+        
+        self.assertIsNone(root.thread_root_id)
+        self.assertEqual(reply.thread_root_id, root.id)
+        self.assertEqual(nested_reply.thread_root_id, root.id)
+        self.assertEqual(nested_reply.get_thread_root(), root)
+        self.assertEqual(
+            list(nested_reply.get_thread_messages()),
+            [root, reply, nested_reply]
+        )
+    
+    def test_partial_save_keeps_thread_root_without_loading_parent(self):
+        """Test that saves not touching parent_message leave thread_root alone."""
+        root = Message.objects.create(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Root message'
+        )
+        Message.objects.create(
+            sender=self.user2,
+            receiver=self.user1,
+            content='Reply',
+            parent_message=root
+        )
+        reply = Message.objects.get(content='Reply')
+        
+        reply.mark_as_read()
+        
+        self.assertFalse(Message.parent_message.is_cached(reply))
+        reply.refresh_from_db()
+        self.assertEqual(reply.thread_root_id, root.id)
+    
+    def test_reply_to_message_view(self):
+        """Test that a reply goes to the other participant and redirects to the root."""
+        root = Message.objects.create(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Root message'
+        )
+        reply = Message.objects.create(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Follow-up',
+            parent_message=root
+        )
+        self.client.force_login(self.user2)
+        
+        response = self.client.post(
+            reverse('messaging:reply_to_message', args=[reply.id]),
+            {'content': 'Answer'}
+        )
+        
+        self.assertRedirects(
+            response,
+            reverse('messaging:conversation_thread', args=[root.id]),
+            fetch_redirect_response=False
+        )
+        answer = Message.objects.get(content='Answer')
+        self.assertEqual(answer.sender, self.user2)
+        self.assertEqual(answer.receiver, self.user1)
+        self.assertEqual(answer.thread_root_id, root.id)
+    
+    def test_reply_to_message_view_non_participant(self):
+        """Test that users outside a conversation cannot reply to it."""
+        outsider = _ensure_user('testuser3')
+        root = Message.objects.create(
+            sender=self.user1,
+            receiver=self.user2,
+            content='Root message'
+        )
+        self.client.force_login(outsider)
+        
+        response = self.client.post(
+            reverse('messaging:reply_to_message', args=[root.id]),
+            {'content': 'Intrusion'}
+        )
+        
+        self.assertRedirects(
+            response,
+            reverse('messaging:message_list'),
+            fetch_redirect_response=False
+        )
+        self.assertFalse(Message.objects.filter(content='Intrusion').exists())
+        
+
+class NotificationViewTest(TestCase):
+    """Test cases for notification views."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data."""
+        cls.user1 = _ensure_user('testuser1')
+        cls.user2 = _ensure_user('testuser2')
+    
+    def test_mark_notification_read_view(self):
+        """Test marking a notification as read."""
+        self.client.force_login(self.user1)
+        notification = create_system_notification(
+            user=self.user1,
+            title='System Update',
+            content='This is a system notification.'
+        )
+        
+        response = self.client.post(
+            reverse('messaging:mark_notification_read', args=[notification.id])
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertJSONEqual(response.content, {'success': True})
+        notification.refresh_from_db()
+        self.assertTrue(notification.is_read)
+    
+    def test_mark_notification_read_view_other_user(self):
+        """Test that users cannot mark another user's notification as read."""
+        self.client.force_login(self.user1)
+        notification = create_system_notification(
+            user=self.user2,
+            title='System Update',
+            content='This is a system notification.'
+        )
+        
+        response = self.client.post(
+            reverse('messaging:mark_notification_read', args=[notification.id])
+        )
+        
+        self.assertEqual(response.status_code, 404)
+        notification.refresh_from_db()
+        self.assertFalse(notification.is_read)
@@ -0,0 +1,22 @@
+"""
+Settings used when running the messaging test suite.
+
+The tests only exercise model and signal logic, so they run against an
+in-memory SQLite database with the cheap MD5 password hasher.
+
+Usage:
+    python manage.py test messaging --settings=messaging.tests_settings
+"""
+
+from messaging_project.settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
@@ -12,6 +12,7 @@ urlpatterns = [
     
     # Unread messages URLs
     path('unread/', views.unread_messages, name='unread_messages'),
+    path('api/unread/', views.unread_messages_api, name='unread_messages_api'),
     path('mark-message-read/<int:message_id>/', views.mark_message_read, name='mark_message_read'),
     path('mark-all-read/', views.mark_all_messages_read, name='mark_all_messages_read'),
     
@@ -22,6 +23,5 @@ urlpatterns = [
     # Account deletion URLs
     path('delete-account/', views.delete_account_confirm, name='delete_account_confirm'),
     path('delete-account/confirm/', views.delete_account, name='delete_account'),
-    path('delete-user/', views.delete_user, name='delete_user'),
     path('account-deleted/', views.account_deleted, name='account_deleted'),
 ]
\ No newline at end of file
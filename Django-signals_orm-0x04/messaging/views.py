@@ -1,24 +1,65 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.contrib.auth import logout
 from django.db import transaction
 from django.urls import reverse_lazy
 from django.views.decorators.http import require_POST
 from django.views.decorators.cache import cache_page
-from django.db.models import Q
-from .models import Message, Notification, MessageHistory
+from django.core.cache import cache
+from django.db.models import F, Func, IntegerField, OuterRef, Q, Subquery
+from .managers import CONVERSATIONS_CACHE_TIMEOUT, conversations_cache_key
+from .models import Message, MessageHistory, Notification
+from .tasks import cascade_delete_user
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Number of notifications shown per page of notification_list
+NOTIFICATIONS_PAGE_SIZE = 50
+
+# Maximum number of messages returned by unread_messages_api
+UNREAD_MESSAGES_API_LIMIT = 50
+
+
+def _count_subquery(queryset):
+    """Wrap a queryset as a scalar ``COUNT(*)`` subquery."""
+    return Subquery(
+        queryset.order_by().annotate(
+            count=Func(F('pk'), function='COUNT', output_field=IntegerField())
+        ).values('count')
+    )
+
+
+def _get_user_data_counts(user):
+    """
+    Count the messages, notifications and edits owned by a user.
+    All four counts are fetched in a single query.
+    """
+    return User.objects.filter(pk=user.pk).annotate(
+        sent_messages_count=_count_subquery(Message.objects.filter(sender=OuterRef('pk'))),
+        received_messages_count=_count_subquery(Message.objects.filter(receiver=OuterRef('pk'))),
+        notifications_count=_count_subquery(Notification.objects.filter(user=OuterRef('pk'))),
+        message_edits_count=_count_subquery(MessageHistory.objects.filter(edited_by=OuterRef('pk'))),
+    ).values(
+        'sent_messages_count',
+        'received_messages_count',
+        'notifications_count',
+        'message_edits_count',
+    ).get()
+
 
 @login_required
 def message_list(request):
     """Display list of conversation threads for the current user."""
-    # Get all conversation threads for the user
-    conversations = Message.get_user_conversations(request.user)
+    # Get all conversation threads for the user; invalidated by the Message post_save
+    # signal and by the bulk is_read updates through invalidate_read_state()
+    cache_key = conversations_cache_key(request.user.pk)
+    conversations = cache.get(cache_key)
+    if conversations is None:
+        conversations = list(Message.get_user_conversations(request.user))
+        cache.set(cache_key, conversations, CONVERSATIONS_CACHE_TIMEOUT)
     
     context = {
         'conversations': conversations,
@@ -30,22 +71,28 @@ def message_list(request):
 @cache_page(60)  # Cache for 60 seconds
 def conversation_thread(request, thread_id):
     """Display a specific conversation thread with all replies."""
-    thread = get_object_or_404(Message, id=thread_id)
+    thread = get_object_or_404(
+        Message.objects.select_related('sender', 'receiver'),
+        id=thread_id
+    )
     
     # Check if user is a participant in this thread
-    if request.user not in [thread.sender, thread.receiver]:
+    if request.user.id not in (thread.sender_id, thread.receiver_id):
         messages.error(request, "You don't have permission to view this conversation.")
         return redirect('messaging:message_list')
     
     # Get all messages in the thread with optimized queries
     thread_messages = thread.get_thread_messages()
     
-    # Mark messages as read
-    unread_messages = thread_messages.filter(
+    # Mark messages as read with a single UPDATE; their senders' cached
+    # conversation lists show is_read too, so they are dropped as well
+    unread_in_thread = thread_messages.filter(
         receiver=request.user,
         is_read=False
     )
-    unread_messages.update(is_read=True)
+    sender_ids = set(unread_in_thread.values_list('sender_id', flat=True))
+    if sender_ids and unread_in_thread.update(is_read=True):
+        Message.unread.invalidate_read_state(request.user.pk, *sender_ids)
     
     context = {
         'thread': thread,
@@ -64,8 +111,11 @@ def send_message(request):
         parent_message_id = request.POST.get('parent_message')
         
         if receiver_id and content:
-            try:
-                receiver = User.objects.get(id=receiver_id)
+            # filter().first() turns an unknown receiver into None instead of raising
+            receiver = User.objects.filter(id=receiver_id).first()
+            if receiver is None:
+                messages.error(request, 'Invalid receiver selected.')
+            else:
                 parent_message = None
                 
                 # Check if this is a reply
@@ -86,18 +136,15 @@ def send_message(request):
                 
                 if parent_message:
                     messages.success(request, 'Reply sent successfully!')
-                    return redirect('messaging:conversation_thread', thread_id=parent_message.get_thread_root().id)
+                    return redirect('messaging:conversation_thread', thread_id=parent_message.thread_root_id or parent_message.id)
                 else:
                     messages.success(request, 'Message sent successfully!')
                     return redirect('messaging:message_list')
-                    
-            except User.DoesNotExist:
-                messages.error(request, 'Invalid receiver selected.')
         else:
             messages.error(request, 'Please provide both receiver and message content.')
     
-    # Get list of users for the form
-    users = User.objects.exclude(id=request.user.id)
+    # Get list of users for the form; the <select> only needs id and username
+    users = User.objects.exclude(pk=request.user.pk).only('id', 'username').order_by('username')
     context = {
         'users': users,
     }
@@ -107,7 +154,13 @@ def send_message(request):
 @login_required
 def reply_to_message(request, message_id):
     """Handle replying to a specific message."""
-    parent_message = get_object_or_404(Message, id=message_id)
+    parent_messages = Message.objects.all()
+    if request.method == 'POST':
+        # A reply only needs the parent's ids, not its content
+        parent_messages = parent_messages.only(
+            'id', 'sender_id', 'receiver_id', 'parent_message_id', 'thread_root_id'
+        )
+    parent_message = get_object_or_404(parent_messages, id=message_id)
     
     # Check if user can reply to this message
     if not parent_message.can_reply(request.user):
@@ -119,21 +172,21 @@ def reply_to_message(request, message_id):
         
         if content:
             # Determine the receiver (the other participant in the thread)
-            if request.user == parent_message.sender:
-                receiver = parent_message.receiver
+            if request.user.pk == parent_message.sender_id:
+                receiver_id = parent_message.receiver_id
             else:
-                receiver = parent_message.sender
+                receiver_id = parent_message.sender_id
             
             # Create the reply
             reply = Message.objects.create(
                 sender=request.user,
-                receiver=receiver,
+                receiver_id=receiver_id,
                 content=content,
                 parent_message=parent_message
             )
             
             messages.success(request, 'Reply sent successfully!')
-            return redirect('messaging:conversation_thread', thread_id=parent_message.get_thread_root().id)
+            return redirect('messaging:conversation_thread', thread_id=parent_message.thread_root_id or parent_message.id)
         else:
             messages.error(request, 'Please provide message content.')
     
@@ -146,11 +199,22 @@ def reply_to_message(request, message_id):
 
 @login_required
 def notification_list(request):
-    """Display list of notifications for the current user."""
-    notifications = Notification.objects.filter(user=request.user).select_related('message')
+    """Display a page of notifications for the current user, newest first."""
+    notifications = Notification.objects.filter(
+        user=request.user
+    ).select_related('message').order_by('-id')
+    
+    # Keyset pagination: ?before=<id> returns the page older than that notification
+    before = request.GET.get('before', '')
+    if before.isdigit():
+        notifications = notifications.filter(id__lt=int(before))
+    
+    notifications = list(notifications[:NOTIFICATIONS_PAGE_SIZE])
+    next_cursor = notifications[-1].id if len(notifications) == NOTIFICATIONS_PAGE_SIZE else None
     
     context = {
         'notifications': notifications,
+        'next_cursor': next_cursor,
     }
     return render(request, 'messaging/notification_list.html', context)
 
@@ -172,27 +236,65 @@ def unread_messages(request):
 
 
 @login_required
+def unread_messages_api(request):
+    """Return the latest unread messages for the current user as JSON."""
+    unread = Message.unread.for_user(request.user).values(
+        'id', 'sender__username', 'content', 'timestamp'
+    )[:UNREAD_MESSAGES_API_LIMIT]
+    
+    return JsonResponse({
+        'unread': list(unread),
+        'unread_count': Message.unread.count_for_user(request.user),
+    })
+
+
+@require_POST
 def mark_message_read(request, message_id):
     """Mark a specific message as read."""
-    try:
-        message = Message.objects.get(
-            id=message_id,
-            receiver=request.user
-        )
-        message.mark_as_read()
-        return JsonResponse({'success': True})
-    except Message.DoesNotExist:
-        return JsonResponse({'success': False, 'error': 'Message not found'})
+    # JSON endpoint: answer anonymous clients with a bare 401 instead of a login redirect
+    if not request.user.is_authenticated:
+        return HttpResponse(status=401)
+    
+    # The sender's cached conversation list shows is_read too, so fetch their id
+    message = Message.objects.filter(id=message_id, receiver=request.user)
+    sender_id = message.values_list('sender_id', flat=True).first()
+    if sender_id is None:
+        return JsonResponse({'success': False, 'error': 'Message not found'}, status=404)
+    # A single UPDATE instead of fetch + save
+    message.update(is_read=True)
+    
+    # update() skips the post_save receivers, so sync their side effects here
+    Notification.objects.filter(
+        user=request.user,
+        message_id=message_id,
+        is_read=False
+    ).update(is_read=True)
+    Message.unread.invalidate_read_state(request.user.pk, sender_id)
+    return JsonResponse({'success': True})
 
 
 @login_required
 def mark_all_messages_read(request):
     """Mark all unread messages for the user as read."""
     if request.method == 'POST':
-        # Use the custom manager with optimized query using .only()
-        unread_messages = Message.unread.unread_for_user(request.user)
-        count = unread_messages.count()
-        unread_messages.update(read=True, is_read=True)
+        # update() skips the post_save receivers, so first mark the notifications
+        # of the affected messages read in one statement, as the receiver would
+        Notification.objects.filter(
+            user=request.user,
+            message__receiver=request.user,
+            message__is_read=False,
+            is_read=False
+        ).update(is_read=True)
+        
+        unread = Message.objects.filter(
+            receiver=request.user,
+            is_read=False
+        )
+        # The senders' cached conversation lists show is_read too
+        sender_ids = set(unread.values_list('sender_id', flat=True).distinct())
+        # A single UPDATE; its row count replaces a separate COUNT query
+        count = unread.update(is_read=True)
+        Message.unread.invalidate_read_state(request.user.pk, *sender_ids)
         
         messages.success(request, f'{count} messages marked as read.')
         return redirect('messaging:unread_messages')
@@ -203,15 +305,15 @@ def mark_all_messages_read(request):
 @login_required
 def mark_notification_read(request, notification_id):
     """Mark a notification as read."""
-    try:
-        notification = Notification.objects.get(
-            id=notification_id,
-            user=request.user
-        )
-        notification.mark_as_read()
-        return JsonResponse({'success': True})
-    except Notification.DoesNotExist:
-        return JsonResponse({'success': False, 'error': 'Notification not found'})
+    # A single UPDATE; the affected row count tells whether the notification exists
+    updated = Notification.objects.filter(
+        id=notification_id,
+        user=request.user
+    ).update(is_read=True)
+    
+    if not updated:
+        return JsonResponse({'success': False, 'error': 'Notification not found'}, status=404)
+    return JsonResponse({'success': True})
 
 
 @login_required
@@ -220,73 +322,16 @@ def delete_account_confirm(request):
     if request.method == 'POST':
         return delete_account(request)
     
-    # Get user statistics for confirmation
-    sent_messages_count = Message.objects.filter(sender=request.user).count()
-    received_messages_count = Message.objects.filter(receiver=request.user).count()
-    notifications_count = Notification.objects.filter(user=request.user).count()
-    message_edits_count = MessageHistory.objects.filter(edited_by=request.user).count()
+    # Get user statistics for confirmation in a single query
+    counts = _get_user_data_counts(request.user)
     
     context = {
-        'sent_messages_count': sent_messages_count,
-        'received_messages_count': received_messages_count,
-        'notifications_count': notifications_count,
-        'message_edits_count': message_edits_count,
-        'total_data_count': sent_messages_count + received_messages_count + notifications_count + message_edits_count,
+        **counts,
+        'total_data_count': sum(counts.values()),
     }
     return render(request, 'messaging/delete_account_confirm.html', context)
 
 
-@login_required
-def delete_user(request):
-    """Delete the user's account and all associated data."""
-    user = request.user
-    username = user.username
-    
-    try:
-        with transaction.atomic():
-            # Delete all data associated with the user
-            # Messages sent by the user
-            sent_messages_count = Message.objects.filter(sender=user).count()
-            Message.objects.filter(sender=user).delete()
-            
-            # Messages received by the user
-            received_messages_count = Message.objects.filter(receiver=user).count()
-            Message.objects.filter(receiver=user).delete()
-            
-            # Notifications for the user
-            notifications_count = Notification.objects.filter(user=user).count()
-            Notification.objects.filter(user=user).delete()
-            
-            # Message history edits by the user
-            message_edits_count = MessageHistory.objects.filter(edited_by=user).count()
-            MessageHistory.objects.filter(edited_by=user).delete()
-            
-            # Finally, delete the user
-            user.delete()
-            
-            # Log out the user
-            logout(request)
-            
-            messages.success(
-                request, 
-                f'Account "{username}" has been successfully deleted. '
-                f'Removed: {sent_messages_count} sent messages, '
-                f'{received_messages_count} received messages, '
-                f'{notifications_count} notifications, '
-                f'{message_edits_count} message edits.'
-            )
-            
-            return redirect('messaging:account_deleted')
-            
-    except Exception as e:
-        messages.error(
-            request, 
-            f'An error occurred while deleting your account: {str(e)}. '
-            'Please try again or contact support.'
-        )
-        return redirect('messaging:delete_account_confirm')
-
-
 @login_required
 @require_POST
 def delete_account(request):
@@ -295,40 +340,27 @@ def delete_account(request):
     username = user.username
     
     try:
+        counts = _get_user_data_counts(user)
+        
         with transaction.atomic():
-            # Delete all data associated with the user
-            # Messages sent by the user
-            sent_messages_count = Message.objects.filter(sender=user).count()
-            Message.objects.filter(sender=user).delete()
-            
-            # Messages received by the user
-            received_messages_count = Message.objects.filter(receiver=user).count()
-            Message.objects.filter(receiver=user).delete()
-            
-            # Notifications for the user
-            notifications_count = Notification.objects.filter(user=user).count()
-            Notification.objects.filter(user=user).delete()
-            
-            # Message history edits by the user
-            message_edits_count = MessageHistory.objects.filter(edited_by=user).count()
-            MessageHistory.objects.filter(edited_by=user).delete()
-            
-            # Finally, delete the user
-            user.delete()
-            
-            # Log out the user
-            logout(request)
-            
-            messages.success(
-                request, 
-                f'Account "{username}" has been successfully deleted. '
-                f'Removed: {sent_messages_count} sent messages, '
-                f'{received_messages_count} received messages, '
-                f'{notifications_count} notifications, '
-                f'{message_edits_count} message edits.'
-            )
-            
-            return redirect('messaging:account_deleted')
+            # Messages, notifications and message history all cascade from the user.
+            # Runs inline: the project has no task queue to hand the job to yet.
+            cascade_delete_user(user.pk)
+        
+        # Log out the user once the transaction has committed, so the session
+        # write does not extend the time the deletion holds its locks
+        logout(request)
+        
+        messages.success(
+            request, 
+            f'Account "{username}" has been successfully deleted. '
+            f'Removed: {counts["sent_messages_count"]} sent messages, '
+            f'{counts["received_messages_count"]} received messages, '
+            f'{counts["notifications_count"]} notifications, '
+            f'{counts["message_edits_count"]} message edits.'
+        )
+        
+        return redirect('messaging:account_deleted')
             
     except Exception as e:
         messages.error(
@@ -2,6 +2,14 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 import uuid
 
+# Seconds a cached page of MessageViewSet.list stays valid
+MESSAGE_LIST_CACHE_TIMEOUT = 60
+
+
+def message_list_version_key(conversation_pk):
+    """Cache key holding the current message list version of a conversation."""
+    return f'msglist-version:{conversation_pk}'
+
 # Create your models here.
 
 class user(AbstractUser):
@@ -26,9 +34,15 @@ class Conversation(models.Model):
     conversation_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     participants = models.ManyToManyField(user, related_name='conversations')
     created_at = models.DateTimeField(auto_now_add=True)
+    is_archived = models.BooleanField(default=False, db_index=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
-        return f"Conversation {self.id} with {self.participants.count()} participants"
+        return f"Conversation {self.id}"
     
 class Message(models.Model):
     message_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
@@ -36,5 +50,13 @@ class Message(models.Model):
     sender = models.ForeignKey(user, related_name='sent_messages', on_delete=models.CASCADE)
     message_body = models.TextField()
     sent_at = models.DateTimeField(auto_now_add=True)    
+    is_read = models.BooleanField(default=False, db_index=True)
+    
+    class Meta:
+        indexes = [
+            # Per-conversation listings filtered and ordered by sent_at
+            models.Index(fields=['conversation', 'sent_at']),
+        ]
+    
     def __str__(self):
         return f"Message from {self.sender.username} in Conversation {self.conversation.id} at {self.timestamp}"
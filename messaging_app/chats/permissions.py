@@ -1,6 +1,28 @@
 from rest_framework import permissions
 from rest_framework.permissions import BasePermission
 
+
+def get_user_conversation_ids(request):
+    """
+    Return the set of conversation pks the requesting user participates in.
+    The set is loaded once and kept on the request for later checks.
+    """
+    if not hasattr(request, '_user_conversation_ids'):
+        request._user_conversation_ids = set(
+            request.user.conversations.values_list('pk', flat=True)
+        )
+    return request._user_conversation_ids
+
+
+def is_conversation_participant(request, conversation_pk):
+    """Return True if the requesting user participates in conversation_pk."""
+    try:
+        conversation_pk = int(conversation_pk)
+    except (TypeError, ValueError):
+        return False
+    return conversation_pk in get_user_conversation_ids(request)
+
+
 class IsParticipantofConversation(BasePermission):
     """
     Custom permission to check if the user is a participant of the conversation for PUT, PATCH, and DELETE requests.
@@ -8,8 +30,11 @@ class IsParticipantofConversation(BasePermission):
     def has_permission(self, request, view):
         if request.method not in ["PUT", "PATCH", "DELETE"]:
             return True  # Allow other methods
-        conversation_id = view.kwargs.get('pk')
-        if not conversation_id:
+        # Nested under conversations/<conversation_pk>/; 'pk' is the message
+        conversation_pk = view.kwargs.get('conversation_pk')
+        if not conversation_pk:
             return False
         user = request.user
-        return user.is_authenticated and user.conversations.filter(conversation_id=conversation_id).exists()
\ No newline at end of file
+        if not user.is_authenticated:
+            return False
+        return is_conversation_participant(request, conversation_pk)
\ No newline at end of file
@@ -20,6 +20,7 @@ class MessageSerializer(serializers.ModelSerializer):
 
 class ConversationSerializer(serializers.ModelSerializer):
     message = serializers.SerializerMethodField()
+    participant_count = serializers.IntegerField(read_only=True)
     
     def get_message(self, obj):
         messages = obj.messages.all()
@@ -27,7 +28,7 @@ class ConversationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Conversation
-        fields = ['conversation_id', 'created_at', 'participants', 'message']
+        fields = ['conversation_id', 'created_at', 'participants', 'participant_count', 'message']
         read_only_fields = ['conversation_id', 'created_at']
         
     def create(self, validated_data):
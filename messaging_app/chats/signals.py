@@ -0,0 +1,15 @@
+import time
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Message, message_list_version_key
+
+
+@receiver([post_save, post_delete], sender=Message)
+def invalidate_message_list_cache(sender, instance, **kwargs):
+    """Move the conversation to a new message list version so cached pages go stale."""
+    cache.set(
+        message_list_version_key(instance.conversation_id),
+        time.time_ns(),
+        None
+    )
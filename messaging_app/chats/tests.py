@@ -1,3 +1,99 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .models import Conversation, Message, user
+
+
+class MessageListCacheTest(APITestCase):
+    """The cached message list must follow creates and deletes"""
+    
+    def setUp(self):
+        cache.clear()
+        self.alice = user.objects.create_user(username='alice', email='alice@example.com', password='pass')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice)
+        self.list_url = reverse('conversation-messages-list', kwargs={'conversation_pk': self.conversation.pk})
+        self.client.force_authenticate(user=self.alice)
+    
+    def test_create_refreshes_cached_list(self):
+        """A message posted to the nested route shows up in the next listing"""
+        self.assertEqual(self.client.get(self.list_url).data['count'], 0)
+        
+        response = self.client.post(self.list_url, {'message_body': 'Hello'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Message.objects.get().conversation_id, self.conversation.pk)
+        
+        self.assertEqual(self.client.get(self.list_url).data['count'], 1)
+    
+    def test_delete_refreshes_cached_list(self):
+        """A deleted message disappears from the next listing"""
+        message = Message.objects.create(conversation=self.conversation, sender=self.alice, message_body='Hello')
+        self.assertEqual(self.client.get(self.list_url).data['count'], 1)
+        
+        detail_url = reverse('conversation-messages-detail', kwargs={
+            'conversation_pk': self.conversation.pk, 'pk': message.pk})
+        response = self.client.delete(detail_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        
+        self.assertEqual(self.client.get(self.list_url).data['count'], 0)
+    
+    def test_cached_pages_do_not_overlap(self):
+        """A cached first page and a fresh second page split the messages in sent_at order"""
+        created = [
+            Message.objects.create(conversation=self.conversation, sender=self.alice, message_body=f'Message {i}')
+            for i in range(3)
+        ]
+        first = self.client.get(self.list_url, {'page_size': 2})
+        # Served from the cache the second time
+        self.assertEqual(self.client.get(self.list_url, {'page_size': 2}).data, first.data)
+        second = self.client.get(self.list_url, {'page_size': 2, 'page': 2})
+        
+        listed = [m['message_id'] for m in first.data['results'] + second.data['results']]
+        self.assertEqual(listed, [str(m.message_id) for m in created])
+    
+    def test_non_participant_cannot_post(self):
+        """Posting into someone else's conversation is refused and writes nothing"""
+        mallory = user.objects.create_user(username='mallory', email='mallory@example.com', password='pass')
+        self.client.force_authenticate(user=mallory)
+        
+        response = self.client.post(self.list_url, {'message_body': 'Hello'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Message.objects.exists())
+
+
+class NonParticipantActionTest(APITestCase):
+    """archive and mark_read answer 404 to users outside the conversation"""
+    
+    def setUp(self):
+        self.alice = user.objects.create_user(username='alice', email='alice@example.com', password='pass')
+        self.mallory = user.objects.create_user(username='mallory', email='mallory@example.com', password='pass')
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice)
+        self.message = Message.objects.create(conversation=self.conversation, sender=self.alice, message_body='Hello')
+        self.client.force_authenticate(user=self.mallory)
+    
+    def test_archive_returns_404(self):
+        url = reverse('conversation-archive', kwargs={'pk': self.conversation.pk})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.conversation.refresh_from_db()
+        self.assertFalse(self.conversation.is_archived)
+    
+    def test_mark_read_returns_404(self):
+        url = reverse('conversation-messages-mark-read', kwargs={
+            'conversation_pk': self.conversation.pk, 'pk': self.message.pk})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.message.refresh_from_db()
+        self.assertFalse(self.message.is_read)
+    
+    def test_participant_can_mark_read(self):
+        self.client.force_authenticate(user=self.alice)
+        url = reverse('conversation-messages-mark-read', kwargs={
+            'conversation_pk': self.conversation.pk, 'pk': self.message.pk})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.message.refresh_from_db()
+        self.assertTrue(self.message.is_read)
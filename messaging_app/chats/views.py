@@ -1,11 +1,16 @@
+import hashlib
+import time
 from django.shortcuts import render
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Prefetch
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import PermissionDenied
 from django_filters import rest_framework as filters
-from .models import Conversation, Message, user
+from .models import MESSAGE_LIST_CACHE_TIMEOUT, Conversation, Message, message_list_version_key, user
 from .serializers import ConversationSerializer, MessageSerializer
-from .permissions import IsParticipantofConversation
+from .permissions import IsParticipantofConversation, is_conversation_participant
 from .auth import CustomAuthentication
 from rest_framework.permissions import IsAuthenticated
 from .pagination import StandardResultsSetPagination
@@ -16,11 +21,17 @@ from .filters import MessageFilter
 
 class ConversationFilter(filters.FilterSet):
     created_at = filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
-    participant = filters.CharFilter(field_name='participants__username', lookup_expr='icontains')
+    participant = filters.CharFilter(method='filter_participant')
     
     class Meta:
         model = Conversation
         fields = ['created_at', 'participant']
+    
+    def filter_participant(self, queryset, name, value):
+        # Match through an IN subquery so the outer query needs no M2M join or DISTINCT
+        return queryset.filter(
+            pk__in=Conversation.objects.filter(participants__username__icontains=value).values('pk')
+        )
 
 
 class ConversationViewSet(viewsets.ModelViewSet):
@@ -30,13 +41,30 @@ class ConversationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user_id = self.request.user.user_id
-        return self.queryset.filter(participants__user_id=user_id)
+        # Membership is an EXISTS semi-join on the M2M table, so it adds no join
+        # to the participant count and never duplicates conversation rows
+        participates = Conversation.participants.through.objects.filter(
+            conversation_id=OuterRef('pk'), user__user_id=user_id
+        )
+        # Load participants and messages for the whole page in two extra queries
+        return self.queryset.annotate(
+            participant_count=Count('participants')
+        ).filter(Exists(participates)).prefetch_related(
+            Prefetch('participants', queryset=user.objects.only('id', 'user_id', 'username')),
+            # The nested MessageSerializer only renders sender as a pk, so no sender join
+            Prefetch('messages', queryset=Message.objects.only(
+                'id', 'message_id', 'conversation_id', 'sender_id', 'message_body', 'sent_at'
+            )),
+        )
     
     @action(detail=True, methods=['post'])
     def archive(self, request, pk=None):
-        conversation = self.get_object()
-        conversation.is_archived = True
-        conversation.save()
+        # A single UPDATE; the row count tells whether the user may archive it
+        updated = Conversation.objects.filter(
+            pk=pk, participants__user_id=request.user.user_id
+        ).update(is_archived=True)
+        if not updated:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
         return Response({'status': 'conversation archived'}, status=status.HTTP_200_OK)
 
 
@@ -57,22 +85,49 @@ class MessageViewSet(viewsets.ModelViewSet):
     pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
-        user_id = self.request.user.user_id
-        conversation_id = self.kwargs.get('conversation_id')
-        # Explicitly use Message.objects.filter
-        return Message.objects.filter(
-            conversation__conversation_id=conversation_id,
-            conversation__participants__user_id=user_id)
+        conversation_pk = self.kwargs.get('conversation_pk')
+        # Membership comes from the per-request id set, so no participants join is needed
+        if not is_conversation_participant(self.request, conversation_pk):
+            return Message.objects.none().order_by('sent_at', 'id')
+        # Explicitly use Message.objects.filter; MessageSerializer renders sender and
+        # conversation as pks, so only the serialized columns are loaded and nothing is joined.
+        # Pages follow the (conversation, sent_at) index; id breaks ties between equal timestamps
+        return Message.objects.only(
+            'id', 'message_id', 'conversation_id', 'sender_id', 'message_body', 'sent_at'
+        ).filter(
+            conversation_id=conversation_pk
+        ).order_by('sent_at', 'id')
+    
+    def list(self, request, *args, **kwargs):
+        conversation_pk = self.kwargs.get('conversation_pk')
+        # The version changes whenever a message of the conversation is saved or deleted
+        # Seeded like the signal receiver, so a fresh version never repeats an older one
+        version = cache.get_or_set(message_list_version_key(conversation_pk), time.time_ns, None)
+        # The user id is part of the key so one user's page is never served to another
+        query_hash = hashlib.md5(request.GET.urlencode().encode()).hexdigest()
+        cache_key = f'msglist:{conversation_pk}:{request.user.user_id}:{version}:{query_hash}'
+        # Pages come from the sent_at ordered queryset, so cached and fresh pages line up
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, MESSAGE_LIST_CACHE_TIMEOUT)
+        return response
     
     def perform_create(self, serializer):
-        serializer.save(sender=self.request.user)
+        conversation_pk = self.kwargs['conversation_pk']
+        if not is_conversation_participant(self.request, conversation_pk):
+            raise PermissionDenied('You are not a participant of this conversation.')
+        serializer.save(sender=self.request.user, conversation_id=conversation_pk)
         
     @action(detail=True, methods=['post'])
-    def mark_read(self, request, pk=None):
-        message = self.get_object()
-        # Example permission check using HTTP_403_FORBIDDEN
-        if message.conversation not in self.request.user.conversations.all():
-            return Response({'detail': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
-        message.is_read = True
-        message.save()
+    def mark_read(self, request, pk=None, conversation_pk=None):
+        # A single UPDATE limited to this conversation; 0 rows means missing or forbidden
+        if not is_conversation_participant(request, conversation_pk):
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        updated = Message.objects.filter(
+            pk=pk, conversation_id=conversation_pk
+        ).update(is_read=True)
+        if not updated:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
         return Response({'status': 'message marked as read'}, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -105,6 +105,9 @@ DATABASES = {
         'PASSWORD': config('MYSQL_PASSWORD', default='messaging_password'),
         'HOST': config('MYSQL_HOST', default='db'),
         'PORT': config('MYSQL_PORT', default='3306'),
+        # Keep connections open between requests; health checks drop dead ones first
+        'CONN_MAX_AGE': config('MYSQL_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'charset': 'utf8mb4',
         },
@@ -1,16 +1,45 @@
 import sqlite3
 
+# Applied once to every new connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Connections handed out in shared mode, keyed by database path
+_shared_connections = {}
+
+
+def open_connection(database_path):
+    """Open an autocommit connection to database_path with the pragmas applied."""
+    connection = sqlite3.connect(
+        database_path, isolation_level=None, check_same_thread=False
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        connection.execute(pragma)
+    return connection
+
+
 class DatabaseConnection:
-    def __init__(self, database_path):
+    def __init__(self, database_path, shared=False):
         self.database_path = database_path
+        self.shared = shared
         self.connection = None
     
     def __enter__(self):
-        self.connection = sqlite3.connect(self.database_path)
+        if self.shared:
+            # Reuse one connection per path instead of reconnecting each time
+            if self.database_path not in _shared_connections:
+                _shared_connections[self.database_path] = open_connection(self.database_path)
+            self.connection = _shared_connections[self.database_path]
+        else:
+            self.connection = open_connection(self.database_path)
         return self.connection
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.connection:
+        if self.connection and not self.shared:
             self.connection.close()
 
 if __name__ == "__main__":
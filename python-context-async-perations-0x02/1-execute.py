@@ -1,20 +1,25 @@
 import sqlite3
 class ExecuteQuery:
-    def __init__(self, db_path):
+    def __init__(self, db_path, query, params=()):
         self.db_path = db_path
+        self.query = query
+        self.params = params
         self.connection = None
 
     def __enter__(self):
         self.connection = sqlite3.connect(self.db_path)
-        return self.connection
+        # Connection.execute() creates the cursor itself; return the rows directly
+        try:
+            return self.connection.execute(self.query, self.params).fetchall()
+        except Exception:
+            # __exit__ does not run when __enter__ raises, so close here
+            self.connection.close()
+            raise
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.connection.close()
 
-with ExecuteQuery('users.db') as conn:
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM users where age > ?",(25,))
-    users = cursor.fetchall()
+with ExecuteQuery('users.db', "SELECT * FROM users where age > ?", (25,)) as users:
     print(users)
 
 
@@ -3,20 +3,20 @@ import aiosqlite
 
 tasks = ["async def async_fetch_users()", "async def async_fetch_older_users()"]
 
-async def async_fetch_users(db_path):
-    async with aiosqlite.connect(db_path) as conn:
-        async with conn.cursor() as cursor:
-            await cursor.execute("SELECT * FROM users")
-            return await cursor.fetchall()
+async def async_fetch_users(conn):
+    async with conn.execute("SELECT * FROM users") as cursor:
+        return await cursor.fetchall()
         
-async def async_fetch_older_users(db_path):
-    async with aiosqlite.connect(db_path) as conn:
-        async with conn.cursor() as cursor:
-            await cursor.execute("SELECT * FROM users WHERE age > ?",(40,)) 
-            return await cursor.fetchall()
+async def async_fetch_older_users(conn):
+    async with conn.execute("SELECT * FROM users WHERE age > ?",(40,)) as cursor:
+        return await cursor.fetchall()
         
 async def fetch_concurrently():
-    results = await asyncio.gather(async_fetch_users('users.db'), async_fetch_older_users('users.db'))
+    # Both queries share one connection instead of opening one each
+    async with aiosqlite.connect('users.db') as conn:
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        results = await asyncio.gather(async_fetch_users(conn), async_fetch_older_users(conn))
     print(results)
 
 asyncio.run(fetch_concurrently())
\ No newline at end of file
@@ -1,21 +1,10 @@
 import mysql.connector
 from typing import Generator, Dict, Any
+from db_pool import connect_to_prodev
 
 
-def connect_to_prodev():
-    """Connects to the ALX_prodev database in MySQL"""
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="ALX_prodev",
-            port=3306
-        )
-        return connection
-    except mysql.connector.Error as err:
-        print(f"Error connecting to ALX_prodev database: {err}")
-        return None
+# Number of rows pulled from the cursor per fetchmany() call
+FETCH_SIZE = 10000
 
 
 def stream_users() -> Generator[Dict[str, Any], None, None]:
@@ -31,11 +20,12 @@ def stream_users() -> Generator[Dict[str, Any], None, None]:
         cursor = connection.cursor(dictionary=True)
         cursor.execute("SELECT * FROM user_data ORDER BY user_id")
         
+        # fetchmany() pulls rows from the connector in batches instead of one call per row
         while True:
-            row = cursor.fetchone()
-            if row is None:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
                 break
-            yield row
+            yield from rows
         
         cursor.close()
     except mysql.connector.Error as err:
@@ -1,27 +1,13 @@
 import mysql.connector
-from typing import Generator, Dict, Any, List
+from typing import Generator, Dict, Any, List, Optional
+from db_pool import connect_to_prodev
 
 
-def connect_to_prodev():
-    """Connects to the ALX_prodev database in MySQL"""
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="ALX_prodev",
-            port=3306
-        )
-        return connection
-    except mysql.connector.Error as err:
-        print(f"Error connecting to ALX_prodev database: {err}")
-        return None
-
-
-def stream_users_in_batches(batch_size: int) -> Generator[List[Dict[str, Any]], None, None]:
+def stream_users_in_batches(batch_size: int, min_age: Optional[float] = None) -> Generator[List[Dict[str, Any]], None, None]:
     """
     Generator function that yields batches of rows from the user_data table.
     Uses yield to stream data in batches efficiently.
+    If min_age is given, only users older than min_age are returned.
     """
     connection = connect_to_prodev()
     if not connection:
@@ -29,23 +15,20 @@ def stream_users_in_batches(batch_size: int) -> Generator[List[Dict[str, Any]],
     
     try:
         cursor = connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM user_data ORDER BY user_id")
+        if min_age is None:
+            cursor.execute("SELECT * FROM user_data ORDER BY user_id")
+        else:
+            # Filter in SQL so rows that would be discarded never leave the server
+            cursor.execute(
+                "SELECT * FROM user_data WHERE age > %s ORDER BY user_id", (min_age,)
+            )
         
-        batch = []
+        # fetchmany() builds each batch in the connector; the last one may be shorter
         while True:
-            row = cursor.fetchone()
-            if row is None:
-                # Yield remaining batch if not empty
-                if batch:
-                    yield batch
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
                 break
-            
-            batch.append(row)
-            
-            # Yield batch when it reaches the specified size
-            if len(batch) >= batch_size:
-                yield batch
-                batch = []
+            yield batch
         
         cursor.close()
     except mysql.connector.Error as err:
@@ -59,13 +42,11 @@ def batch_processing(batch_size: int) -> Generator[Dict[str, Any], None, None]:
     Processes batches of users and filters those over 25 years old.
     Uses yield to stream filtered results.
     """
-    # Loop 1: Iterate through batches
-    for batch in stream_users_in_batches(batch_size):
+    # Loop 1: Iterate through batches; the database only returns users over 25
+    for batch in stream_users_in_batches(batch_size, min_age=25):
         # Loop 2: Process each user in the batch
         for user in batch:
-            # Loop 3: Filter users over 25
-            if user['age'] > 25:
-                yield user
+            yield user
 
 
 if __name__ == "__main__":
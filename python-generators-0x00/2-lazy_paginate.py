@@ -1,35 +1,24 @@
 import mysql.connector
 from typing import Generator, Dict, Any, List
+from db_pool import connect_to_prodev
 
 
-def connect_to_prodev():
-    """Connects to the ALX_prodev database in MySQL"""
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="ALX_prodev",
-            port=3306
-        )
-        return connection
-    except mysql.connector.Error as err:
-        print(f"Error connecting to ALX_prodev database: {err}")
-        return None
-
-
-def paginate_users(page_size: int, offset: int) -> List[Dict[str, Any]]:
+def paginate_users(page_size: int, offset: int, connection=None) -> List[Dict[str, Any]]:
     """
     Fetches a specific page of users from the database.
     Returns a list of users for the given page size and offset.
+    Uses the given connection if any, otherwise opens and closes its own.
     """
-    connection = connect_to_prodev()
+    owns_connection = connection is None
+    if owns_connection:
+        connection = connect_to_prodev()
     if not connection:
         return []
     
     try:
         cursor = connection.cursor(dictionary=True)
-        query = "SELECT * FROM user_data LIMIT %s OFFSET %s"
+        # A stable order keeps rows from moving between pages
+        query = "SELECT * FROM user_data ORDER BY user_id LIMIT %s OFFSET %s"
         cursor.execute(query, (page_size, offset))
         
         users = cursor.fetchall()
@@ -39,7 +28,8 @@ def paginate_users(page_size: int, offset: int) -> List[Dict[str, Any]]:
         print(f"Error paginating users: {err}")
         return []
     finally:
-        connection.close()
+        if owns_connection:
+            connection.close()
 
 
 def lazy_paginate(page_size: int) -> Generator[Dict[str, Any], None, None]:
@@ -48,22 +38,30 @@ def lazy_paginate(page_size: int) -> Generator[Dict[str, Any], None, None]:
     Only fetches the next page when needed, starting at offset 0.
     Uses yield to stream users one by one.
     """
+    # One connection serves every page instead of a new handshake per page
+    connection = connect_to_prodev()
+    if not connection:
+        return
+    
     offset = 0
     
-    while True:
-        # Fetch the next page of users
-        page_users = paginate_users(page_size, offset)
-        
-        # If no users returned, we've reached the end
-        if not page_users:
-            break
-        
-        # Yield each user from the current page
-        for user in page_users:
-            yield user
-        
-        # Move to the next page
-        offset += page_size
+    try:
+        while True:
+            # Fetch the next page of users
+            page_users = paginate_users(page_size, offset, connection)
+            
+            # If no users returned, we've reached the end
+            if not page_users:
+                break
+            
+            # Yield each user from the current page
+            for user in page_users:
+                yield user
+            
+            # Move to the next page
+            offset += page_size
+    finally:
+        connection.close()
 
 
 if __name__ == "__main__":
@@ -1,21 +1,10 @@
 import mysql.connector
 from typing import Generator, float
+from db_pool import connect_to_prodev
 
 
-def connect_to_prodev():
-    """Connects to the ALX_prodev database in MySQL"""
-    try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="ALX_prodev",
-            port=3306
-        )
-        return connection
-    except mysql.connector.Error as err:
-        print(f"Error connecting to ALX_prodev database: {err}")
-        return None
+# Number of rows pulled from the cursor per fetchmany() call
+FETCH_SIZE = 10000
 
 
 def stream_user_ages() -> Generator[float, None, None]:
@@ -31,11 +20,13 @@ def stream_user_ages() -> Generator[float, None, None]:
         cursor = connection.cursor()
         cursor.execute("SELECT age FROM user_data")
         
+        # fetchmany() pulls rows from the connector in batches instead of one call per row
         while True:
-            row = cursor.fetchone()
-            if row is None:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
                 break
-            yield row[0]  # Yield the age value
+            for row in rows:
+                yield row[0]  # Yield the age value
         
         cursor.close()
     except mysql.connector.Error as err:
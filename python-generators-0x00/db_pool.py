@@ -0,0 +1,33 @@
+import mysql.connector
+import mysql.connector.pooling
+
+
+# Connections to ALX_prodev are reused through a pool created on first use
+POOL_SIZE = 8
+_pool = None
+
+
+def connect_to_prodev():
+    """
+    Connects to the ALX_prodev database in MySQL.
+    Returns a pooled connection; close() hands it back to the pool.
+    """
+    global _pool
+    try:
+        if _pool is None:
+            _pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name="prodev",
+                pool_size=POOL_SIZE,
+                # A generator closed early leaves unread rows; consume them when the
+                # connection goes back to the pool instead of failing the session reset
+                consume_results=True,
+                host="localhost",
+                user="root",
+                password="",
+                database="ALX_prodev",
+                port=3306
+            )
+        return _pool.get_connection()
+    except mysql.connector.Error as err:
+        print(f"Error connecting to ALX_prodev database: {err}")
+        return None
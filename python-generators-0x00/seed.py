@@ -1,7 +1,15 @@
 import mysql.connector
 import uuid
 import csv
-from typing import Generator, Dict, Any
+from itertools import islice
+from typing import Generator, Dict, Any, Iterable
+
+
+# Number of rows pulled from the cursor per fetchmany() call
+FETCH_SIZE = 10000
+
+# Number of rows sent per executemany() call when inserting
+INSERT_BATCH_SIZE = 10000
 
 
 def connect_db():
@@ -58,7 +66,8 @@ def create_table(connection):
             name VARCHAR(255) NOT NULL,
             email VARCHAR(255) NOT NULL,
             age DECIMAL(3,1) NOT NULL,
-            INDEX idx_user_id (user_id)
+            INDEX idx_user_id (user_id),
+            INDEX idx_age (age)
         )
         """
         cursor.execute(create_table_query)
@@ -68,40 +77,46 @@ def create_table(connection):
         print(f"Error creating table: {err}")
 
 
-def insert_data(connection, data):
-    """Inserts data in the database if it does not exist"""
+def insert_data(connection, data: Iterable[Dict[str, Any]]):
+    """Inserts the records in the database, skipping user_ids that already exist"""
     try:
         cursor = connection.cursor()
         
-        # Check if data already exists
-        check_query = "SELECT COUNT(*) FROM user_data WHERE user_id = %s"
-        cursor.execute(check_query, (data['user_id'],))
-        exists = cursor.fetchone()[0] > 0
+        # Existing user_ids are left untouched by the no-op update
+        insert_query = """
+        INSERT INTO user_data (user_id, name, email, age)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE user_id = user_id
+        """
+        rows = (
+            (record['user_id'], record['name'], record['email'], record['age'])
+            for record in data
+        )
+        
+        total = 0
+        inserted = 0
+        while True:
+            batch = list(islice(rows, INSERT_BATCH_SIZE))
+            if not batch:
+                break
+            cursor.executemany(insert_query, batch)
+            total += len(batch)
+            inserted += cursor.rowcount
         
-        if not exists:
-            insert_query = """
-            INSERT INTO user_data (user_id, name, email, age)
-            VALUES (%s, %s, %s, %s)
-            """
-            cursor.execute(insert_query, (
-                data['user_id'],
-                data['name'],
-                data['email'],
-                data['age']
-            ))
-            connection.commit()
-            print(f"Inserted user: {data['name']}")
-        else:
-            print(f"User {data['name']} already exists, skipping...")
+        # Commit once for the whole load
+        connection.commit()
+        print(f"Inserted {inserted} users, skipped {total - inserted} existing users")
         
         cursor.close()
     except mysql.connector.Error as err:
         print(f"Error inserting data: {err}")
 
 
-def load_csv_data(filename: str) -> list:
-    """Load data from CSV file"""
-    data = []
+def load_csv_data(filename: str) -> Generator[Dict[str, Any], None, None]:
+    """
+    Generator that yields records from the CSV file one by one
+    """
+    count = 0
     try:
         with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
@@ -112,12 +127,12 @@ def load_csv_data(filename: str) -> list:
                 
                 # Convert age to decimal
                 row['age'] = float(row['age'])
-                data.append(row)
-        print(f"Loaded {len(data)} records from {filename}")
-        return data
+                count += 1
+                yield row
+        print(f"Loaded {count} records from {filename}")
     except FileNotFoundError:
         print(f"CSV file {filename} not found. Creating sample data...")
-        return create_sample_data()
+        yield from create_sample_data()
 
 
 def create_sample_data() -> list:
@@ -141,11 +156,12 @@ def stream_users(connection) -> Generator[Dict[str, Any], None, None]:
         cursor = connection.cursor(dictionary=True)
         cursor.execute("SELECT * FROM user_data ORDER BY user_id")
         
+        # fetchmany() pulls rows from the connector in batches instead of one call per row
         while True:
-            row = cursor.fetchone()
-            if row is None:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
                 break
-            yield row
+            yield from rows
         
         cursor.close()
     except mysql.connector.Error as err:
@@ -173,8 +189,7 @@ def main():
     
     # Step 5: Load and insert data
     data = load_csv_data('user_data.csv')
-    for record in data:
-        insert_data(prodev_connection, record)
+    insert_data(prodev_connection, data)
     
     # Step 6: Demonstrate the generator
     print("\n--- Streaming users from database ---")